@@ -3,15 +3,21 @@
 # Test runner script for a2a_mcp project
 set -e
 
+MARKER="not integration"
+if [ "$1" == "--integration" ]; then
+    MARKER="integration"
+fi
+
 echo "Installing test dependencies..."
 uv sync --extra dev
 
-echo "Running unit tests..."
-uv run pytest tests/test_orchestrator_agent.py -v -m "not integration"
+echo "Running tests (-m \"$MARKER\")..."
+uv run pytest tests/ -v -m "$MARKER"
 
 echo ""
 echo "To run integration tests (requires API keys), use:"
-echo "  bash run_integration_tests.sh"
+echo "  bash run_tests.sh --integration"
 echo "  or: uv run pytest tests/ -v -m integration"
+echo "To list the slowest tests, add: --durations=20"
 
-echo "Unit test run complete!"
\ No newline at end of file
+echo "Test run complete!"
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import click
 
+from a2a_mcp.common.utils import bootstrap_env
 from a2a_mcp.mcp import server
 
 
@@ -26,6 +27,7 @@ from a2a_mcp.mcp import server
     help='MCP Transport',
 )
 def main(command, host, port, transport) -> None:
+    bootstrap_env()
     # TODO: Add other servers, perhaps dynamic port allocation
     if command == 'mcp-server':
         server.serve(host, port, transport)
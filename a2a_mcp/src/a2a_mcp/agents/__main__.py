@@ -1,5 +1,6 @@
 # type: ignore
 
+import contextlib
 import json
 import logging
 import sys
@@ -20,6 +21,8 @@ from a2a.server.tasks import (
 from a2a.types import AgentCard
 from a2a_mcp.common import prompts
 from a2a_mcp.common.agent_executor import GenericAgentExecutor
+from a2a_mcp.common.utils import bootstrap_env
+from a2a_mcp.common.workflow import close_httpx_client, get_httpx_client
 from adk_travel_agent import TravelAgent
 from langgraph_planner_agent import LangGraphPlannerAgent
 from orchestrator_agent import OrchestratorAgent
@@ -67,12 +70,26 @@ def get_agent(agent_card: AgentCard):
         raise e
 
 
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Creates the shared workflow HTTP client on startup, closes it on shutdown.
+
+    Both happen on the server's event loop, which the client is bound to.
+    """
+    get_httpx_client()
+    try:
+        yield
+    finally:
+        await close_httpx_client()
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10101)
 @click.option('--agent-card', 'agent_card')
 def main(host, port, agent_card):
     """Starts an Agent server."""
+    bootstrap_env()
     try:
         if not agent_card:
             raise ValueError('Agent card is required')
@@ -99,7 +116,7 @@ def main(host, port, agent_card):
 
         logger.info(f'Starting server on {host}:{port}')
 
-        uvicorn.run(server.build(), host=host, port=port)
+        uvicorn.run(server.build(lifespan=lifespan), host=host, port=port)
     except FileNotFoundError:
         logger.error(f"Error: File '{agent_card}' not found.")
         sys.exit(1)
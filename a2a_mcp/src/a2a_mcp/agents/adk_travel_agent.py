@@ -6,7 +6,6 @@ import re
 
 from collections.abc import AsyncIterable
 from typing import Any
-from dotenv import load_dotenv
 
 from a2a_mcp.common.agent_runner import AgentRunner
 from a2a_mcp.common.base_agent import BaseAgent
@@ -17,9 +16,6 @@ from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import SseServerParams
 from google.genai import types as genai_types
 
-# Load environment variables
-load_dotenv('/home/toannguyen19/my_workspace/a2a-samples/my-a2a-tutorial/.env')
-
 
 logger = logging.getLogger(__name__)
 
@@ -1,29 +1,22 @@
 # type: ignore
 
+import functools
 import logging
 import os
 
 from collections.abc import AsyncIterable
 from typing import Any, Literal
-from dotenv import load_dotenv
 
 from a2a_mcp.common import prompts
 from a2a_mcp.common.base_agent import BaseAgent
 from a2a_mcp.common.types import TaskList
 from langchain_core.messages import AIMessage
-from langchain_openai import AzureChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel, Field
 from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
-# Load environment variables
-load_dotenv('/home/toannguyen19/my_workspace/a2a-samples/my-a2a-tutorial/.env')
 
-
-memory = MemorySaver()
 logger = logging.getLogger(__name__)
 
 
@@ -68,10 +61,65 @@ class ResponseFormat(BaseModel):
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _checkpointer():
+    """Returns the in-memory checkpointer shared by all planner agents."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver()
+
+
+@functools.lru_cache(maxsize=1)
+def _chat_model():
+    """Returns the chat model shared by all planner agent instances."""
+    from langchain_openai import AzureChatOpenAI
+
+    return AzureChatOpenAI(
+        model="gpt-4.1-mini",
+        temperature=0,
+        api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+        api_version=os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01'),
+        azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT')
+    )
+
+
+# Serializes ResponseFormat.content, which is a plain list of tasks.
+_TASKS_ADAPTER = TypeAdapter(list[Task])
+
+# Response payloads share their keys, each response is a copy of one of
+# these with the content filled in.
+_WORKING_TEMPLATE = {
+    'response_type': 'text',
+    'is_task_complete': False,
+    'require_user_input': False,
+    'content': None,
+}
+_INPUT_TEMPLATE = {
+    'response_type': 'text',
+    'is_task_complete': False,
+    'require_user_input': True,
+    'content': None,
+}
+_COMPLETED_TEMPLATE = {
+    'response_type': 'data',
+    'is_task_complete': True,
+    'require_user_input': False,
+    'content': None,
+}
+_ERROR_TEMPLATE = {
+    'is_task_complete': False,
+    'require_user_input': True,
+    'content': 'We are unable to process your request at the moment. Please try again.',
+}
+
+
 class LangGraphPlannerAgent(BaseAgent):
     """Planner Agent backed by LangGraph."""
 
     def __init__(self):
+        # Imported here so importing this module stays cheap.
+        from langgraph.prebuilt import create_react_agent
+
         logger.info('Initializing LanggraphPlannerAgent')
 
         super().__init__(
@@ -80,23 +128,17 @@ class LangGraphPlannerAgent(BaseAgent):
             content_types=['text', 'text/plain'],
         )
 
-        self.model = AzureChatOpenAI(
-            model="gpt-4.1-mini",
-            temperature=0,
-            api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-            api_version=os.getenv('AZURE_OPENAI_API_VERSION', '2024-02-01'),
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT')
-        )
+        self.model = _chat_model()
 
         self.graph = create_react_agent(
             self.model,
-            checkpointer=memory,
+            checkpointer=_checkpointer(),
             prompt=prompts.PLANNER_COT_INSTRUCTIONS,
             response_format=ResponseFormat,
             tools=[],
         )
 
-    def invoke(self, query, session_id) -> str:
+    async def invoke(self, query, session_id) -> str:
         """
         Invoke the LangGraph planner agent with a user query and session ID.
 
@@ -108,7 +150,7 @@ class LangGraphPlannerAgent(BaseAgent):
             str: The agent's response.
         """
         config = {'configurable': {'thread_id': session_id}}
-        self.graph.invoke({'messages': [('user', query)]}, config)
+        await self.graph.ainvoke({'messages': [('user', query)]}, config)
         return self.get_agent_response(config)
 
     async def stream(
@@ -121,15 +163,14 @@ class LangGraphPlannerAgent(BaseAgent):
             f'Running LanggraphPlannerAgent stream for session {sessionId} {task_id} with input {query}'
         )
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
+        async for item in self.graph.astream(
+            inputs, config, stream_mode='values'
+        ):
             message = item['messages'][-1]
             if isinstance(message, AIMessage):
-                yield {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': message.content,
-                }
+                response = _WORKING_TEMPLATE.copy()
+                response['content'] = message.content
+                yield response
         yield self.get_agent_response(config)
 
     def get_agent_response(self, config):
@@ -138,32 +179,14 @@ class LangGraphPlannerAgent(BaseAgent):
         if structured_response and isinstance(
             structured_response, ResponseFormat
         ):
-            if (
-                structured_response.status == 'input_required'
-                # and structured_response.content.tasks
-            ):
-                return {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.question,
-                }
-            if structured_response.status == 'error':
-                return {
-                    'response_type': 'text',
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.question,
-                }
+            if structured_response.status in ('input_required', 'error'):
+                response = _INPUT_TEMPLATE.copy()
+                response['content'] = structured_response.question
+                return response
             if structured_response.status == 'completed':
-                return {
-                    'response_type': 'data',
-                    'is_task_complete': True,
-                    'require_user_input': False,
-                    'content': structured_response.content.model_dump(),
-                }
-        return {
-            'is_task_complete': False,
-            'require_user_input': True,
-            'content': 'We are unable to process your request at the moment. Please try again.',
-        }
+                response = _COMPLETED_TEMPLATE.copy()
+                response['content'] = _TASKS_ADAPTER.dump_python(
+                    structured_response.content
+                )
+                return response
+        return _ERROR_TEMPLATE.copy()
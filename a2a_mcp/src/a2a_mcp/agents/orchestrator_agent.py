@@ -3,7 +3,6 @@ import logging
 import os
 
 from collections.abc import AsyncIterable
-from dotenv import load_dotenv
 
 from a2a.types import (
     SendStreamingMessageSuccessResponse,
@@ -16,9 +15,6 @@ from a2a_mcp.common.base_agent import BaseAgent
 from a2a_mcp.common.workflow import Status, WorkflowGraph, WorkflowNode
 from openai import AzureOpenAI
 
-# Load environment variables
-load_dotenv('/home/toannguyen19/my_workspace/a2a-samples/my-a2a-tutorial/.env')
-
 
 logger = logging.getLogger(__name__)
 
@@ -1,11 +1,28 @@
 # type: ignore
 import logging
 import os
+from dotenv import load_dotenv
 from a2a_mcp.common.types import ServerConfig
 
 
 logger = logging.getLogger(__name__)
 
+_ENV_LOADED = False
+
+
+def bootstrap_env():
+    """Load environment variables from the .env file, once per process.
+
+    The file defaults to `.env` in the working directory and can be
+    overridden with `A2A_ENV_FILE`. Variables already set in the
+    environment take precedence.
+    """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    load_dotenv(os.getenv('A2A_ENV_FILE', '.env'))
+    _ENV_LOADED = True
+
 
 def config_logging():
     """Configure basic logging."""
@@ -25,6 +25,28 @@ from a2a_mcp.mcp import client
 
 logger = logging.getLogger(__name__)
 
+_httpx_client = None
+
+
+def get_httpx_client() -> httpx.AsyncClient:
+    """Returns the HTTP client shared by all workflow nodes.
+
+    Reusing one client keeps connections to the agents alive across nodes
+    and workflows, instead of a new connection pool per node.
+    """
+    global _httpx_client
+    if _httpx_client is None or _httpx_client.is_closed:
+        _httpx_client = httpx.AsyncClient()
+    return _httpx_client
+
+
+async def close_httpx_client() -> None:
+    """Closes the shared HTTP client, if one was created."""
+    global _httpx_client
+    if _httpx_client is not None:
+        await _httpx_client.aclose()
+        _httpx_client = None
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -93,30 +115,29 @@ class WorkflowNode:
             agent_card = await self.get_planner_resource()
         else:
             agent_card = await self.find_agent_for_task()
-        async with httpx.AsyncClient() as httpx_client:
-            client = A2AClient(httpx_client, agent_card)
-
-            payload: dict[str, any] = {
-                'message': {
-                    'role': 'user',
-                    'parts': [{'kind': 'text', 'text': query}],
-                    'messageId': uuid4().hex,
-                    'taskId': task_id,
-                    'contextId': context_id,
-                },
-            }
-            request = SendStreamingMessageRequest(
-                id=str(uuid4()), params=MessageSendParams(**payload)
-            )
-            response_stream = client.send_message_streaming(request)
-            async for chunk in response_stream:
-                # Save the artifact as a result of the node
-                if isinstance(
-                    chunk.root, SendStreamingMessageSuccessResponse
-                ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
-                    artifact = chunk.root.result.artifact
-                    self.results = artifact
-                yield chunk
+        client = A2AClient(get_httpx_client(), agent_card)
+
+        payload: dict[str, any] = {
+            'message': {
+                'role': 'user',
+                'parts': [{'kind': 'text', 'text': query}],
+                'messageId': uuid4().hex,
+                'taskId': task_id,
+                'contextId': context_id,
+            },
+        }
+        request = SendStreamingMessageRequest(
+            id=str(uuid4()), params=MessageSendParams(**payload)
+        )
+        response_stream = client.send_message_streaming(request)
+        async for chunk in response_stream:
+            # Save the artifact as a result of the node
+            if isinstance(
+                chunk.root, SendStreamingMessageSuccessResponse
+            ) and (isinstance(chunk.root.result, TaskArtifactUpdateEvent)):
+                artifact = chunk.root.result.artifact
+                self.results = artifact
+            yield chunk
 
 
 class WorkflowGraph:
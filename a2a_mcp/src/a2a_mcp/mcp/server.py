@@ -1,30 +1,82 @@
 # type: ignore
-import json
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
 import os
+import re
 import sqlite3
+import threading
+import time
 import traceback
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING
 
-from openai import AzureOpenAI
-import numpy as np
-import pandas as pd
-import requests
+import orjson
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
 
+# numpy and openai are imported where they are used, so importing this
+# module (e.g. for the a2a-mcp CLI) does not pay for them.
+if TYPE_CHECKING:
+    import numpy as np
 
-# Load environment variables from .env file
-load_dotenv('/home/toannguyen19/my_workspace/a2a-samples/my-a2a-tutorial/.env')
+    from openai import AzureOpenAI
 
 logger = get_logger(__name__)
 AGENT_CARDS_DIR = 'agent_cards'
 EMBEDDING_MODEL = 'text-embedding-3-large'
+EMBEDDING_BATCH_SIZE = 100
+EMBEDDING_MAX_CONCURRENCY = 4
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+EMBEDDINGS_CACHE_FILE = 'card_embeddings.npz'
 SQLLITE_DB = 'travel_agency.db'
+# The travel data is read-only, identical queries within the TTL are served
+# from memory.
+QUERY_RESULT_CACHE_SIZE = 128
+QUERY_RESULT_TTL = 30.0
 PLACES_API_URL = 'https://places.googleapis.com/v1/places:searchText'
 
+# Guards the shared sqlite connection and the query result cache, tools
+# may run on worker threads.
+_DB_LOCK = threading.Lock()
+_QUERY_RESULTS = OrderedDict()
+_SELECT_RE = re.compile(r'\s*SELECT\b', re.IGNORECASE)
+
+# Loaded agent cards, populated by `build_agent_card_embeddings`. Card i is
+# served as CARD_URIS[i] with content CARD_JSON[i], and row i of
+# CARD_EMB_MATRIX holds its L2-normalized embedding.
+CARD_URIS = []
+CARD_JSON = []
+URI_TO_IDX = {}
+CARD_EMB_MATRIX = None
+
+
+def _embed_client_config() -> dict:
+    """Returns the Azure OpenAI settings used for embeddings."""
+    return {
+        'api_key': os.getenv('EMBEDDING_AZURE_OPENAI_API_KEY'),
+        'api_version': os.getenv('EMBEDDING_AZURE_OPENAI_API_VERSION'),
+        'azure_endpoint': os.getenv('EMBEDDING_AZURE_OPENAI_ENDPOINT'),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _embed_client() -> AzureOpenAI:
+    """Returns the shared Azure OpenAI client used for embeddings.
+
+    The client is created on first use and reused afterwards, so the
+    underlying HTTP connection pool is shared across calls.
+    """
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(**_embed_client_config())
+
 
 def generate_embeddings(text):
     """Generates embeddings for the given text using Azure OpenAI.
@@ -35,11 +87,7 @@ def generate_embeddings(text):
     Returns:
         A list of embeddings representing the input text.
     """
-    client = AzureOpenAI(
-        api_key=os.getenv('EMBEDDING_AZURE_OPENAI_API_KEY'),
-        api_version=os.getenv('EMBEDDING_AZURE_OPENAI_API_VERSION'),
-        azure_endpoint=os.getenv('EMBEDDING_AZURE_OPENAI_ENDPOINT')
-    )
+    client = _embed_client()
     response = client.embeddings.create(
         model=EMBEDDING_MODEL,
         input=text
@@ -47,9 +95,158 @@ def generate_embeddings(text):
     return response.data[0].embedding
 
 
+async def _generate_embeddings_async(texts):
+    """Embeds `texts` in batches, up to `EMBEDDING_MAX_CONCURRENCY` at once."""
+    from openai import AsyncAzureOpenAI
+
+    semaphore = asyncio.Semaphore(EMBEDDING_MAX_CONCURRENCY)
+    async with AsyncAzureOpenAI(**_embed_client_config()) as client:
+
+        async def embed_batch(batch):
+            async with semaphore:
+                response = await client.embeddings.create(
+                    model=EMBEDDING_MODEL, input=batch
+                )
+            return [d.embedding for d in response.data]
+
+        batches = await asyncio.gather(
+            *(
+                embed_batch(texts[start : start + EMBEDDING_BATCH_SIZE])
+                for start in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+            )
+        )
+    return [embedding for batch in batches for embedding in batch]
+
+
+def generate_embeddings_batch(texts):
+    """Generates embeddings for a list of texts using Azure OpenAI.
+
+    The texts are sent in batches of `EMBEDDING_BATCH_SIZE`, and the
+    batches are requested concurrently. Must not be called from a running
+    event loop.
+
+    Args:
+        texts: The input strings for which to generate embeddings.
+
+    Returns:
+        A list of embeddings, in the same order as the input texts.
+    """
+    return asyncio.run(_generate_embeddings_async(texts))
+
+
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """Stacks embeddings into a float32 array and L2-normalizes each row.
+
+    float32 keeps `find_agent` on numpy's BLAS dot product, which has no
+    float16 path.
+
+    Args:
+        embeddings: A single embedding or a sequence of embeddings.
+
+    Returns:
+        The normalized embeddings, so a dot product is the cosine similarity.
+    """
+    import numpy as np
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix
+
+
+@functools.lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def embed_query(query: str) -> np.ndarray:
+    """Generates the normalized embedding for a `find_agent` query.
+
+    Results are cached by query string, planners tend to emit the same
+    sub tasks repeatedly and each miss costs a round trip to Azure.
+
+    Args:
+        query: The natural language query string.
+
+    Returns:
+        The normalized query embedding, marked read-only as it is shared
+        by every caller that hits the cache.
+    """
+    query_embedding = normalize_embeddings(generate_embeddings(query))
+    query_embedding.flags.writeable = False
+    return query_embedding
+
+
+@functools.lru_cache(maxsize=1)
+def _db_connection() -> sqlite3.Connection:
+    """Returns the sqlite connection shared by all travel data queries.
+
+    The connection is opened once, read-only, so queries reuse its page and
+    statement caches and the tracked database file is never modified.
+    """
+    return sqlite3.connect(
+        f'file:{SQLLITE_DB}?mode=ro', uri=True, check_same_thread=False
+    )
+
+
+def run_select_query(query: str) -> str:
+    """Runs a read-only query against the travel database.
+
+    Results are cached for `QUERY_RESULT_TTL` seconds, keyed by the
+    exact query string.
+
+    Args:
+        query: The SQL SELECT statement to run.
+
+    Returns:
+        The rows serialized as json, structured as {'results': [...]}.
+    """
+    now = time.monotonic()
+    with _DB_LOCK:
+        cached = _QUERY_RESULTS.get(query)
+        if cached and now - cached[0] < QUERY_RESULT_TTL:
+            _QUERY_RESULTS.move_to_end(query)
+            return cached[1]
+        cursor = _db_connection().execute(query)
+        rows = cursor.fetchall()
+    columns = [column[0] for column in cursor.description]
+    result = orjson.dumps(
+        {'results': [dict(zip(columns, row)) for row in rows]}
+    ).decode()
+    with _DB_LOCK:
+        _QUERY_RESULTS[query] = (now, result)
+        _QUERY_RESULTS.move_to_end(query)
+        if len(_QUERY_RESULTS) > QUERY_RESULT_CACHE_SIZE:
+            _QUERY_RESULTS.popitem(last=False)
+    return result
+
+
+def _read_agent_card(path: Path):
+    """Reads and parses a single agent card file.
+
+    Args:
+        path: Path of the agent card JSON file.
+
+    Returns:
+        The parsed agent card, or None if the file could not be read.
+    """
+    filename = path.name
+    logger.info(f'Reading file: {filename}')
+    try:
+        return orjson.loads(path.read_bytes())
+    except orjson.JSONDecodeError as jde:
+        logger.error(f'JSON Decoder Error {jde}')
+    except OSError as e:
+        logger.error(f'Error reading file {filename}: {e}.')
+    except Exception as e:
+        logger.error(
+            f'An unexpected error occurred processing {filename}: {e}',
+            exc_info=True,
+        )
+    return None
+
+
 def load_agent_cards():
     """Loads agent card data from JSON files within a specified directory.
 
+    Files are parsed concurrently on a thread pool, results keep the
+    (sorted) file name order.
+
     Returns:
         A list containing JSON data from an agent card file found in the specified directory.
         Returns an empty list if the directory is empty, contains no '.json' files,
@@ -62,63 +259,119 @@ def load_agent_cards():
         logger.error(
             f'Agent cards directory not found or is not a directory: {AGENT_CARDS_DIR}'
         )
-        return agent_cards
+        return card_uris, agent_cards
 
     logger.info(f'Loading agent cards from card repo: {AGENT_CARDS_DIR}')
 
-    for filename in os.listdir(AGENT_CARDS_DIR):
-        if filename.lower().endswith('.json'):
-            file_path = dir_path / filename
-
-            if file_path.is_file():
-                logger.info(f'Reading file: {filename}')
-                try:
-                    with file_path.open('r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        card_uris.append(
-                            f'resource://agent_cards/{Path(filename).stem}'
-                        )
-                        agent_cards.append(data)
-                except json.JSONDecodeError as jde:
-                    logger.error(f'JSON Decoder Error {jde}')
-                except OSError as e:
-                    logger.error(f'Error reading file {filename}: {e}.')
-                except Exception as e:
-                    logger.error(
-                        f'An unexpected error occurred processing {filename}: {e}',
-                        exc_info=True,
-                    )
+    paths = sorted(dir_path.glob('*.json', case_sensitive=False))
+    with ThreadPoolExecutor() as pool:
+        for path, data in zip(paths, pool.map(_read_agent_card, paths)):
+            if data is not None:
+                card_uris.append(f'resource://agent_cards/{path.stem}')
+                agent_cards.append(data)
     logger.info(
         f'Finished loading agent cards. Found {len(agent_cards)} cards.'
     )
     return card_uris, agent_cards
 
 
-def build_agent_card_embeddings() -> pd.DataFrame:
-    """Loads agent cards, generates embeddings for them, and returns a DataFrame.
+def _embedding_key(text: bytes) -> str:
+    """Returns the embeddings cache key for a serialized agent card."""
+    return hashlib.blake2b(
+        EMBEDDING_MODEL.encode() + b'\0' + text, digest_size=16
+    ).hexdigest()
+
+
+def load_cached_embeddings() -> dict[str, np.ndarray]:
+    """Loads previously generated card embeddings from disk.
 
     Returns:
-        Optional[pd.DataFrame]: A Pandas DataFrame containing the original
-        'agent_card' data and their corresponding 'Embeddings'. Returns None
-        if no agent cards were loaded initially or if an exception occurred
-        during the embedding generation process.
+        A dictionary of cache key to embedding. Returns an empty dictionary
+        if the cache file does not exist or cannot be read.
     """
+    import numpy as np
+
+    if not Path(EMBEDDINGS_CACHE_FILE).is_file():
+        return {}
+    try:
+        with np.load(EMBEDDINGS_CACHE_FILE) as data:
+            return {key: data[key] for key in data.files}
+    except Exception as e:
+        logger.error(f'Error reading {EMBEDDINGS_CACHE_FILE}: {e}.')
+        return {}
+
+
+def save_cached_embeddings(embeddings: dict[str, np.ndarray]) -> None:
+    """Writes card embeddings to disk, replacing the previous cache file."""
+    import numpy as np
+
+    try:
+        np.savez_compressed(EMBEDDINGS_CACHE_FILE, **embeddings)
+    except OSError as e:
+        logger.error(f'Error writing {EMBEDDINGS_CACHE_FILE}: {e}.')
+
+
+def generate_card_embeddings(agent_cards):
+    """Returns embeddings for the agent cards, reusing cached ones.
+
+    Each card is keyed by a hash of its serialized content and the
+    embedding model, so editing a card or switching models invalidates
+    only the affected entries.
+
+    Args:
+        agent_cards: The agent card dictionaries.
+
+    Returns:
+        A list of float32 embeddings, in the same order as the cards.
+    """
+    import numpy as np
+
+    texts = [orjson.dumps(card) for card in agent_cards]
+    keys = [_embedding_key(text) for text in texts]
+    cached = load_cached_embeddings()
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    logger.info(
+        f'Reusing {len(keys) - len(missing)} cached embeddings, generating {len(missing)}'
+    )
+    if missing:
+        embeddings = generate_embeddings_batch(
+            [texts[i].decode() for i in missing]
+        )
+        for i, embedding in zip(missing, embeddings):
+            cached[keys[i]] = np.asarray(embedding, dtype=np.float32)
+    if missing or len(cached) != len(set(keys)):
+        # Drop entries for cards that no longer exist.
+        save_cached_embeddings({key: cached[key] for key in keys})
+    return [cached[key] for key in keys]
+
+
+def build_agent_card_embeddings() -> None:
+    """Loads agent cards and generates embeddings for them.
+
+    Populates `CARD_URIS`, `CARD_JSON`, `URI_TO_IDX` and `CARD_EMB_MATRIX`.
+    The normalized embeddings are stacked once, so `find_agent` does not
+    rebuild the matrix on every query.
+
+    Embeddings are read from `EMBEDDINGS_CACHE_FILE` when the card content
+    is unchanged, only new or edited cards are sent to Azure.
+
+    The cards are left empty if no agent cards were loaded or if an
+    exception occurred during the embedding generation process.
+    """
+    global CARD_URIS, CARD_JSON, URI_TO_IDX, CARD_EMB_MATRIX
     card_uris, agent_cards = load_agent_cards()
     logger.info('Generating Embeddings for agent cards')
     try:
         if agent_cards:
-            df = pd.DataFrame(
-                {'card_uri': card_uris, 'agent_card': agent_cards}
+            CARD_EMB_MATRIX = normalize_embeddings(
+                generate_card_embeddings(agent_cards)
             )
-            df['card_embeddings'] = df.apply(
-                lambda row: generate_embeddings(json.dumps(row['agent_card'])),
-                axis=1,
-            )
-            return df
+            CARD_URIS = card_uris
+            CARD_JSON = agent_cards
+            URI_TO_IDX = {uri: idx for idx, uri in enumerate(card_uris)}
         logger.info('Done generating embeddings for agent cards')
     except Exception as e:
         logger.error(f'An unexpected error occurred : {e}.', exc_info=True)
-        return None
 
 
 def serve(host, port, transport):  # noqa: PLR0915
@@ -135,7 +388,7 @@ def serve(host, port, transport):  # noqa: PLR0915
     logger.info('Starting Agent Cards MCP Server')
     mcp = FastMCP('agent-cards', host=host, port=port)
 
-    df = build_agent_card_embeddings()
+    build_agent_card_embeddings()
 
     @mcp.tool(
         name='find_agent',
@@ -158,24 +411,16 @@ def serve(host, port, transport):  # noqa: PLR0915
             The json representing the agent card deemed most relevant
             to the input query based on embedding similarity.
         """
-        client = AzureOpenAI(
-            api_key=os.getenv('EMBEDDING_AZURE_OPENAI_API_KEY'),
-            api_version=os.getenv('EMBEDDING_AZURE_OPENAI_API_VERSION'),
-            azure_endpoint=os.getenv('EMBEDDING_AZURE_OPENAI_ENDPOINT')
-        )
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=query
-        )
-        query_embedding = response.data[0].embedding
-        dot_products = np.dot(
-            np.stack(df['card_embeddings']), query_embedding
-        )
-        best_match_index = np.argmax(dot_products)
+        import numpy as np
+
+        query_embedding = embed_query(query)
+        dot_products = np.dot(CARD_EMB_MATRIX, query_embedding)
+        # Exact top-1 needs the full scan; argmax is a single O(N) pass.
+        best_match_index = int(dot_products.argmax())
         logger.debug(
             f'Found best match at index {best_match_index} with score {dot_products[best_match_index]}'
         )
-        return df.iloc[best_match_index]['agent_card']
+        return CARD_JSON[best_match_index]
 
     @mcp.tool()
     def query_places_data(query: str):
@@ -218,17 +463,11 @@ def serve(host, port, transport):  # noqa: PLR0915
         # The above is to influence gemini to pickup the tool.
         logger.info(f'Query sqllite : {query}')
 
-        if not query or not query.strip().upper().startswith('SELECT'):
+        if not query or not _SELECT_RE.match(query):
             raise ValueError(f'In correct query {query}')
 
         try:
-            with sqlite3.connect(SQLLITE_DB) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                result = {'results': [dict(row) for row in rows]}
-                return json.dumps(result)
+            return run_select_query(query)
         except Exception as e:
             logger.error(f'Exception running query {e}')
             logger.error(traceback.format_exc())
@@ -252,7 +491,7 @@ def serve(host, port, transport):  # noqa: PLR0915
         """
         resources = {}
         logger.info('Starting read resources')
-        resources['agent_cards'] = df['card_uri'].to_list()
+        resources['agent_cards'] = list(CARD_URIS)
         return resources
 
     @mcp.resource(
@@ -271,12 +510,8 @@ def serve(host, port, transport):  # noqa: PLR0915
         logger.info(
             f'Starting read resource resource://agent_cards/{card_name}'
         )
-        resources['agent_card'] = (
-            df.loc[
-                df['card_uri'] == f'resource://agent_cards/{card_name}',
-                'agent_card',
-            ]
-        ).to_list()
+        idx = URI_TO_IDX.get(f'resource://agent_cards/{card_name}')
+        resources['agent_card'] = [] if idx is None else [CARD_JSON[idx]]
 
         return resources
 
@@ -0,0 +1,58 @@
+"""Shared pytest configuration for the a2a_mcp tests."""
+
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+# Marker expression set by addopts in pytest.ini for the default unit test run.
+UNIT_MARKEXPR = "not integration"
+
+REQUIRED_ENV_VARS = ("AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "OPENAI_API_VERSION")
+
+# Missing required variables, computed once per session by env_setup.
+_MISSING_ENV_VARS = None
+
+
+def _unit_only(config):
+    return config.getoption("markexpr") == UNIT_MARKEXPR
+
+
+def pytest_configure(config):
+    """Stub the openai package for unit-only runs.
+
+    The unit tests patch AzureOpenAI, so importing the real SDK is only
+    collection overhead. Runs that select integration tests keep the real one.
+    """
+    if _unit_only(config) and "openai" not in sys.modules:
+        stub = types.ModuleType("openai")
+        stub.AzureOpenAI = object
+        sys.modules["openai"] = stub
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Skip integration modules when they would be deselected anyway.
+
+    Their imports (langchain-openai, google-adk) need the real openai package.
+    """
+    if _unit_only(config) and collection_path.name.endswith("_integration.py"):
+        return True
+    return None
+
+
+@pytest.fixture(scope="session")
+def env_setup():
+    """Setup environment variables from .env file using dotenv."""
+    global _MISSING_ENV_VARS
+    if _MISSING_ENV_VARS is None:
+        env_file = Path(__file__).parent.parent / ".env"
+        if not env_file.exists():
+            pytest.skip(".env file not found")
+        load_dotenv(env_file, override=False)
+        _MISSING_ENV_VARS = tuple(var for var in REQUIRED_ENV_VARS if not os.environ.get(var))
+
+    if _MISSING_ENV_VARS:
+        pytest.skip(f"Missing required environment variables: {list(_MISSING_ENV_VARS)}")
@@ -1,34 +1,16 @@
 """Simple integration tests for LangGraphPlannerAgent using real Azure OpenAI API calls."""
 
-import os
 import json
-from pathlib import Path
+import logging
 
 import pytest
-from dotenv import load_dotenv
-import sys
 
-# Ensure the parent directory is in the path for imports
-print(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent))
-from src.a2a_mcp.agents.langgraph_planner_agent import LangGraphPlannerAgent
+from a2a_mcp.agents.langgraph_planner_agent import LangGraphPlannerAgent
 
+logger = logging.getLogger(__name__)
 
-@pytest.fixture(scope="session")
-def env_setup():
-    """Setup environment variables from .env file using dotenv."""
-    env_file = Path(__file__).parent.parent / ".env"
-    if env_file.exists():
-        load_dotenv(env_file)
-    else:
-        pytest.skip(".env file not found")
-
-    # Verify required environment variables are set
-    required_vars = ["AZURE_OPENAI_API_KEY", "AZURE_OPENAI_ENDPOINT", "OPENAI_API_VERSION"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
-
-    if missing_vars:
-        pytest.skip(f"Missing required environment variables: {missing_vars}")
+# Keep the real-API tests on a single xdist worker.
+pytestmark = pytest.mark.xdist_group("integration")
 
 
 @pytest.fixture
@@ -50,17 +32,16 @@ def test_planner_agent_initialization(env_setup):
     assert agent.content_types == ["text", "text/plain"]
     assert agent.model is not None
     assert agent.graph is not None
-    print(f"Planner agent initialized successfully")
 
 
 @pytest.mark.integration
-def test_invoke_method_works(planner_agent):
+async def test_invoke_method_works(planner_agent):
     """Test that invoke method works with real API."""
     query = "Plan a simple trip to Paris for 3 days"
     session_id = "test_session_123"
 
     # Call the real API via invoke
-    response = planner_agent.invoke(query, session_id)
+    response = await planner_agent.invoke(query, session_id)
 
     # Basic validation
     assert isinstance(response, dict)
@@ -68,11 +49,10 @@ def test_invoke_method_works(planner_agent):
     assert 'is_task_complete' in response
     assert 'require_user_input' in response
 
-    print(f"Invoke response: {response}")
+    logger.debug(f"Invoke response: {response}")
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
 async def test_stream_method_works(planner_agent):
     """Test that stream method works with real API."""
     query = "Plan a weekend trip to San Francisco"
@@ -96,8 +76,8 @@ async def test_stream_method_works(planner_agent):
         assert 'is_task_complete' in response
         assert 'require_user_input' in response
 
-    print(f"Stream responses count: {len(responses)}")
-    print(f"First response: {responses[0] if responses else 'None'}")
+    logger.debug(f"Stream responses count: {len(responses)}")
+    logger.debug(f"First response: {responses[0] if responses else 'None'}")
 
 
 if __name__ == "__main__":